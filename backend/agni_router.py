@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, Query, Body 
 from sqlalchemy.orm import Session
+from typing import List
 from database import get_db
-from services.agni_logic import calculate_landed_cost, validate_icegate_json, get_odop_intelligence
+from services.agni_logic import calculate_landed_cost, calculate_landed_cost_bulk, validate_icegate_json, get_odop_intelligence
 
 router = APIRouter(prefix="/agni", tags=["Agni Logic"])
 
@@ -11,10 +12,11 @@ def api_landed_cost(
     base_cost: float = Query(...), 
     district: str = Query(None),
     logistics: float = Query(0),
+    as_of: str = Query(None, description="Pricing date (YYYY-MM-DD). Defaults to today."),
     db: Session = Depends(get_db)
 ):
-    # 1. Calc Incentives
-    result = calculate_landed_cost(db, hs_code, base_cost, logistics)
+    # 1. Calc Incentives (rates in force on as_of)
+    result = calculate_landed_cost(db, hs_code, base_cost, logistics, as_of)
     
     # 2. Add ODOP Context if error not present
     if "error" not in result and district:
@@ -24,6 +26,11 @@ def api_landed_cost(
             
     return result
 
+@router.post("/calculator/landed-cost/bulk")
+def api_landed_cost_bulk(items: List[dict] = Body(...), db: Session = Depends(get_db)):
+    # Re-price historical quotes: [{"hs_code", "base_cost", "logistics"?, "as_of"?}]
+    return {"results": calculate_landed_cost_bulk(db, items)}
+
 @router.post("/compliance/validate")
 def api_validate_json(payload: dict = Body(...)):
     return validate_icegate_json(payload)
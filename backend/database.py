@@ -127,6 +127,23 @@ class ExportProduct(Base):
     # 2026 COMPLIANCE (ICEGATE v1.1 Schema Mapping)
     json_template = Column(JSON if 'postgresql' in SQLALCHEMY_DATABASE_URL else TEXT)
 
+class IncentiveRate(Base):
+    __tablename__ = "incentive_rates"
+
+    # Effective-dated: one row per (hs_code, scheme, validity window) so past quotes can be re-priced
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    hs_code = Column(String(10), nullable=False)
+    scheme_name = Column(String, nullable=False) # RoDTEP | DBK
+    rate_pct = Column(Float, nullable=False) # e.g., 4.8 (for 4.8%)
+    valid_from = Column(TEXT, nullable=False) # YYYY-MM-DD (inclusive)
+    valid_to = Column(TEXT) # YYYY-MM-DD (exclusive), NULL = still in force
+    source = Column(String)
+    created_at = Column(String)
+    __table_args__ = (
+        UniqueConstraint('hs_code', 'scheme_name', 'valid_from'),
+        Index('idx_incentive_rates_lookup', 'hs_code', 'scheme_name', 'valid_from'),
+    )
+
 # 7. Document & Quote Management (Module 6)
 class CompanyProfile(Base):
     __tablename__ = "company_profiles"
@@ -17,6 +17,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 from pydantic import BaseModel, Field
 
+from services.incentive_store import incentive_store
+
 # 1. Strict Schema for Financial Data
 class IncentiveRecord(BaseModel):
     hs_code: str = Field(..., min_length=6, max_length=10)
@@ -25,6 +27,7 @@ class IncentiveRecord(BaseModel):
     dbk_rate: float = Field(..., ge=0, le=1.0)
     gst_refund_rate: float = Field(default=0.18) # Default 18% IGST
     schema_ver: str = "v1.1"
+    effective_from: Optional[str] = None # Notification date (YYYY-MM-DD), defaults to run date
 
 # 2. Simulated External Source (DGFT Public Ledger)
 # In a real deployment, this would scrape https://www.dgft.gov.in/CP/?opt=rodtep
@@ -98,6 +101,7 @@ async def run_incentive_ingestor_task(
         "fetched": 0,
         "updated": 0,
         "created": 0,
+        "rate_changes": 0,
         "errors": 0
     }
 
@@ -155,6 +159,14 @@ async def run_incentive_ingestor_task(
                             "tmpl": template
                         })
                         results["created"] += 1
+
+                    # Effective-dated history: export_products holds the latest rate,
+                    # incentive_rates keeps every window so past quotes stay reproducible.
+                    for scheme, rate in (("RoDTEP", record.rodtep_rate), ("DBK", record.dbk_rate)):
+                        if incentive_store.record_rate(db, record.hs_code, scheme, rate * 100,
+                                                       effective_from=record.effective_from,
+                                                       source="DGFT_INCENTIVES"):
+                            results["rate_changes"] += 1
                         
             except Exception as e:
                 results["errors"] += 1
@@ -163,10 +175,12 @@ async def run_incentive_ingestor_task(
         if not dry_run:
             db.commit()
             
-        await log("SUCCESS", f"Incentive Sync Complete. Updated: {results['updated']}, New Fleet Additions: {results['created']}")
+        await log("SUCCESS", f"Incentive Sync Complete. Updated: {results['updated']}, New Fleet Additions: {results['created']}, Rate Changes: {results['rate_changes']}")
 
     except Exception as e:
         await log("CRITICAL", f"Incentive Ingestor Failed: {str(e)}")
         db.rollback()
+    finally:
+        incentive_store.invalidate()
 
     return results
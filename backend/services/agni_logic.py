@@ -1,13 +1,46 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
+from typing import List, Dict, Any
+
+from services.incentive_store import incentive_store, to_date_key
 
 # TASK 1: Incentive Calculator
-def calculate_landed_cost(db: Session, hs_code: str, base_cost: float, logistics: float = 0):
+def calculate_landed_cost(db: Session, hs_code: str, base_cost: float, logistics: float = 0, as_of: str = None):
     # 1. Fetch HS Info
     hs = db.execute(text("SELECT description, regulatory_sensitivity FROM hs_code WHERE hs_code=:h"), {"h": hs_code}).fetchone()
     if not hs:
         return {"error": "HS Code not found"}
     
+    # 2. Fetch Rates in force on the pricing date (effective-dated store)
+    rates = incentive_store.rates_as_of(db, hs_code, as_of)
+    return _price_landed_cost(hs_code, hs, rates, base_cost, logistics, to_date_key(as_of))
+
+def calculate_landed_cost_bulk(db: Session, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Re-price many (historical) quotes in one pass.
+    items: [{"hs_code", "base_cost", "logistics"?, "as_of"?}] - results keep input order.
+    """
+    codes = sorted({item["hs_code"] for item in items})
+    hs_rows = {}
+    if codes:
+        stmt = text("SELECT hs_code, description, regulatory_sensitivity FROM hs_code WHERE hs_code IN :codes") \
+            .bindparams(bindparam("codes", expanding=True))
+        hs_rows = {r.hs_code: (r.description, r.regulatory_sensitivity) for r in db.execute(stmt, {"codes": codes})}
+    
+    all_rates = incentive_store.rates_as_of_many(db, [(item["hs_code"], item.get("as_of")) for item in items])
+    
+    results = []
+    for item, rates in zip(items, all_rates):
+        hs = hs_rows.get(item["hs_code"])
+        if not hs:
+            results.append({"hs_code": item["hs_code"], "error": "HS Code not found"})
+            continue
+        results.append(_price_landed_cost(
+            item["hs_code"], hs, rates, item["base_cost"], item.get("logistics", 0), to_date_key(item.get("as_of"))
+        ))
+    return results
+
+def _price_landed_cost(hs_code: str, hs, rates: List[Dict[str, Any]], base_cost: float, logistics: float, as_of: str):
     desc, sensitivity = hs
     
     # Policy Warning Logic
@@ -23,14 +56,11 @@ def calculate_landed_cost(db: Session, hs_code: str, base_cost: float, logistics
              "warnings": warnings
         }
         
-    # 2. Fetch Rates
-    rates = db.execute(text("SELECT scheme_name, rate_pct FROM incentive_rates WHERE hs_code=:h"), {"h": hs_code}).fetchall()
-    
     benefits = []
     total_benefit = 0
     for r in rates:
-        amt = base_cost * (r.rate_pct / 100.0)
-        benefits.append({"scheme": r.scheme_name, "rate": f"{r.rate_pct}%", "amount": round(amt, 2)})
+        amt = base_cost * (r["rate_pct"] / 100.0)
+        benefits.append({"scheme": r["scheme"], "rate": f"{r['rate_pct']}%", "amount": round(amt, 2)})
         total_benefit += amt
         
     net_price = (base_cost + logistics) - total_benefit
@@ -43,6 +73,7 @@ def calculate_landed_cost(db: Session, hs_code: str, base_cost: float, logistics
         "total_benefit": round(total_benefit, 2),
         "net_export_price": round(net_price, 2),
         "breakdown": benefits,
+        "rates_as_of": as_of,
         "warnings": warnings
     }
 
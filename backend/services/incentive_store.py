@@ -0,0 +1,205 @@
+"""
+Effective-Dated Incentive Rate Store
+
+Keeps one incentive_rates row per (hs_code, scheme, valid_from, valid_to) so that
+a quote priced on any past date can be reproduced with the rates in force that day.
+
+The table is the source of truth. Lookups are served from an in-memory interval
+index (sorted start dates per HS code + scheme, searched with bisect), which is
+rebuilt lazily after every write.
+"""
+
+import bisect
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def to_date_key(value: Any = None) -> str:
+    """Normalise a date/datetime/ISO string (or None for today) to 'YYYY-MM-DD'."""
+    if value is None:
+        return date.today().isoformat()
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+class IncentiveRateStore:
+    """
+    In-memory interval index over incentive_rates.
+
+    Per (hs_code, scheme) the validity windows never overlap, so "rate as of D"
+    is a single bisect over the window start dates. ISO dates compare correctly
+    as strings, which keeps the index free of date parsing.
+    """
+
+    def __init__(self):
+        # hs_code -> scheme -> (starts, windows) where windows[i] = (valid_from, valid_to, rate_pct)
+        self._index: Dict[str, Dict[str, Tuple[List[str], List[Tuple[str, Optional[str], float]]]]] = {}
+        # 8-digit ITC(HS) prefix -> indexed code (10-digit rates answer 8-digit lookups)
+        self._by_prefix: Dict[str, str] = {}
+        self._bind_key: Optional[str] = None
+        self._dirty = True
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------
+
+    def invalidate(self):
+        """Force a rebuild on the next lookup (call after external writes)."""
+        self._dirty = True
+
+    def _ensure_loaded(self, db: Session):
+        bind_key = str(db.get_bind().url)
+        if not self._dirty and self._bind_key == bind_key:
+            return
+
+        with self._lock:
+            if not self._dirty and self._bind_key == bind_key:
+                return
+
+            rows = db.execute(text("""
+                SELECT hs_code, scheme_name, rate_pct, valid_from, valid_to
+                FROM incentive_rates
+                ORDER BY hs_code, scheme_name, valid_from
+            """)).fetchall()
+
+            index = {}
+            by_prefix = {}
+            for hs_code, scheme, rate_pct, valid_from, valid_to in rows:
+                starts, windows = index.setdefault(hs_code, {}).setdefault(scheme, ([], []))
+                starts.append(valid_from)
+                windows.append((valid_from, valid_to, rate_pct))
+                by_prefix.setdefault(hs_code[:8], hs_code)
+
+            self._index = index
+            self._by_prefix = by_prefix
+            self._bind_key = bind_key
+            self._dirty = False
+
+    def _resolve_code(self, hs_code: str) -> Optional[str]:
+        if hs_code in self._index:
+            return hs_code
+        return self._by_prefix.get(hs_code[:8])
+
+    def _lookup(self, hs_code: str, day: str) -> List[Dict[str, Any]]:
+        code = self._resolve_code(hs_code)
+        if code is None:
+            return []
+
+        rates = []
+        for scheme, (starts, windows) in sorted(self._index[code].items()):
+            i = bisect.bisect_right(starts, day) - 1
+            if i < 0:
+                continue
+            valid_from, valid_to, rate_pct = windows[i]
+            if valid_to is None or day < valid_to:
+                rates.append({
+                    "scheme": scheme,
+                    "rate_pct": rate_pct,
+                    "valid_from": valid_from,
+                    "valid_to": valid_to
+                })
+        return rates
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+
+    def rates_as_of(self, db: Session, hs_code: str, as_of: Any = None) -> List[Dict[str, Any]]:
+        """Rates in force for hs_code on as_of (default: today)."""
+        self._ensure_loaded(db)
+        return self._lookup(hs_code, to_date_key(as_of))
+
+    def rates_as_of_many(self, db: Session, queries: Iterable[Tuple[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Bulk as-of lookup for re-pricing historical quotes.
+        queries: iterable of (hs_code, as_of). Results are returned in input order.
+        """
+        self._ensure_loaded(db)
+        return [self._lookup(hs_code, to_date_key(as_of)) for hs_code, as_of in queries]
+
+    def history(self, db: Session, hs_code: str) -> Dict[str, List[Dict[str, Any]]]:
+        """All validity windows per scheme for hs_code, oldest first."""
+        self._ensure_loaded(db)
+        code = self._resolve_code(hs_code)
+        if code is None:
+            return {}
+        return {
+            scheme: [{"valid_from": f, "valid_to": t, "rate_pct": r} for f, t, r in windows]
+            for scheme, (_, windows) in sorted(self._index[code].items())
+        }
+
+    # ------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------
+
+    def record_rate(
+        self,
+        db: Session,
+        hs_code: str,
+        scheme_name: str,
+        rate_pct: float,
+        effective_from: Any = None,
+        source: Optional[str] = None
+    ) -> bool:
+        """
+        Record a rate that takes effect on effective_from (default: today).
+
+        The window in force on that date is closed instead of overwritten, so
+        history is preserved. Returns False if the rate is unchanged.
+        Does NOT commit - the caller owns the transaction.
+        """
+        day = to_date_key(effective_from)
+        rate_pct = round(rate_pct, 4)
+
+        current = db.execute(text("""
+            SELECT id, rate_pct, valid_from FROM incentive_rates
+            WHERE hs_code = :h AND scheme_name = :s AND valid_from <= :d
+              AND (valid_to IS NULL OR valid_to > :d)
+        """), {"h": hs_code, "s": scheme_name, "d": day}).fetchone()
+
+        if current and current.rate_pct == rate_pct:
+            return False
+
+        if current and current.valid_from == day:
+            # Same-day correction: amend the window rather than creating an empty one
+            db.execute(text("UPDATE incentive_rates SET rate_pct = :r, source = :src WHERE id = :id"),
+                       {"r": rate_pct, "src": source, "id": current.id})
+            self._dirty = True
+            return True
+
+        if current:
+            db.execute(text("UPDATE incentive_rates SET valid_to = :d WHERE id = :id"),
+                       {"d": day, "id": current.id})
+
+        # A back-dated rate ends where the next known window starts
+        next_start = db.execute(text("""
+            SELECT MIN(valid_from) FROM incentive_rates
+            WHERE hs_code = :h AND scheme_name = :s AND valid_from > :d
+        """), {"h": hs_code, "s": scheme_name, "d": day}).scalar()
+
+        db.execute(text("""
+            INSERT INTO incentive_rates (hs_code, scheme_name, rate_pct, valid_from, valid_to, source, created_at)
+            VALUES (:h, :s, :r, :f, :t, :src, :now)
+        """), {
+            "h": hs_code,
+            "s": scheme_name,
+            "r": rate_pct,
+            "f": day,
+            "t": next_start,
+            "src": source,
+            "now": datetime.now().isoformat()
+        })
+        self._dirty = True
+        return True
+
+
+# Global singleton
+incentive_store = IncentiveRateStore()
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import Base
+from services.incentive_store import IncentiveRateStore
+from services.agni_logic import calculate_landed_cost_bulk
+import services.agni_logic as agni_logic
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.execute(text("INSERT INTO hs_code (hs_code, description, regulatory_sensitivity) VALUES ('10063020', 'Basmati Rice', 'LOW')"))
+    session.commit()
+    yield session
+    session.close()
+
+def test_rate_change_closes_previous_window(db):
+    store = IncentiveRateStore()
+    assert store.record_rate(db, "1006302000", "RoDTEP", 4.5, effective_from="2025-04-01")
+    assert store.record_rate(db, "1006302000", "RoDTEP", 4.8, effective_from="2026-01-01")
+    # Unchanged rate is a no-op
+    assert not store.record_rate(db, "1006302000", "RoDTEP", 4.8, effective_from="2026-02-01")
+    db.commit()
+
+    history = store.history(db, "1006302000")["RoDTEP"]
+    assert history == [
+        {"valid_from": "2025-04-01", "valid_to": "2026-01-01", "rate_pct": 4.5},
+        {"valid_from": "2026-01-01", "valid_to": None, "rate_pct": 4.8},
+    ]
+
+    assert store.rates_as_of(db, "1006302000", "2024-12-31") == []
+    assert store.rates_as_of(db, "1006302000", "2025-12-31")[0]["rate_pct"] == 4.5
+    assert store.rates_as_of(db, "1006302000", "2026-01-01")[0]["rate_pct"] == 4.8
+
+def test_backdated_rate_ends_at_next_window(db):
+    store = IncentiveRateStore()
+    store.record_rate(db, "1006302000", "DBK", 1.5, effective_from="2026-01-01")
+    store.record_rate(db, "1006302000", "DBK", 1.2, effective_from="2025-06-01")
+    db.commit()
+
+    windows = store.history(db, "1006302000")["DBK"]
+    assert windows[0] == {"valid_from": "2025-06-01", "valid_to": "2026-01-01", "rate_pct": 1.2}
+    assert windows[1]["valid_to"] is None
+
+def test_bulk_reprice_uses_rates_in_force(db, monkeypatch):
+    store = IncentiveRateStore()
+    monkeypatch.setattr(agni_logic, "incentive_store", store)
+    store.record_rate(db, "1006302000", "RoDTEP", 4.5, effective_from="2025-04-01")
+    store.record_rate(db, "1006302000", "RoDTEP", 4.8, effective_from="2026-01-01")
+    db.commit()
+
+    # 8-digit lookups resolve to the 10-digit rate rows
+    results = calculate_landed_cost_bulk(db, [
+        {"hs_code": "10063020", "base_cost": 1000, "as_of": "2025-06-15"},
+        {"hs_code": "10063020", "base_cost": 1000, "as_of": "2026-03-01"},
+        {"hs_code": "99999999", "base_cost": 1000},
+    ])
+
+    assert results[0]["total_benefit"] == 45.0
+    assert results[0]["rates_as_of"] == "2025-06-15"
+    assert results[1]["total_benefit"] == 48.0
+    assert results[2]["error"] == "HS Code not found"